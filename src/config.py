@@ -2,9 +2,14 @@
 Module: Configurations
 
 Public Constants:
-    WHITELIST  (_Whitelist): All the whitelists
-    CHUNK_SIZE (int)       : File read chunk size
+    WHITELIST      (_Whitelist): All the whitelists
+    CHUNK_SIZE     (int)       : File read chunk size
+    MMAP_THRESHOLD (int)       : Minimum file size to hash via memory mapping
+    HEAD_SIZE      (int)       : Size of the head of a file hashed on its own
+    HASH_WORKERS   (int)       : Number of threads hashing files concurrently
+    PRINT_INTERVAL (float)     : Minimum seconds between progress prints
 """
+import os
 import re
 from dataclasses import dataclass
 
@@ -33,19 +38,52 @@ class _Whitelist:
     Dataclass containing all the whitelists
     """
 
-    dirnames: set[str]
-    dirpaths: set[str]
-    filenames: set[str]
-    filepaths: set[str]
-    fileregexes: list[re.Pattern[str]]
+    dirnames: frozenset[str]
+    dirpaths: frozenset[str]
+    filenames: frozenset[str]
+    filepaths: frozenset[str]
+    fileregexes: tuple[re.Pattern[str], ...]
+
+
+def _compile_regexes(regexes: list[str]) -> tuple[re.Pattern[str], ...]:
+    """
+    Compile the regexes. They are merged into one alternation so that each path
+        is only matched once, instead of once per regex. Regexes with groups
+        or global flags (e.g., `(?i)`) would change their meaning once merged,
+        as group numbers shift and global flags must start the pattern; if any
+        regex has them, all are kept separate
+
+    Args:
+        regexes (list[str]): Regexes to compile
+
+    Returns:
+        (tuple[re.Pattern[str], ...]): Compiled regexes
+    """
+    patterns = tuple(re.compile(regex) for regex in regexes)
+    default_flags = re.compile("").flags
+    if len(patterns) < 2 or any(
+        pattern.groups or pattern.flags != default_flags for pattern in patterns
+    ):
+        return patterns
+    return (re.compile("|".join(f"(?:{regex})" for regex in regexes)),)
 
 
 WHITELIST = _Whitelist(
-    set(_WHITELIST_DIRNAMES),
-    set(_WHITELIST_DIRPATHS),
-    set(_WHITELIST_FILENAMES),
-    set(_WHITELIST_FILEPATHS),
-    [re.compile(regex) for regex in _WHITELIST_FILEREGEXES],
+    frozenset(_WHITELIST_DIRNAMES),
+    frozenset(_WHITELIST_DIRPATHS),
+    frozenset(_WHITELIST_FILENAMES),
+    frozenset(_WHITELIST_FILEPATHS),
+    _compile_regexes(_WHITELIST_FILEREGEXES),
 )
 
-CHUNK_SIZE = 1 << 26  # 64 MiB
+# Small enough for each chunk to stay in the CPU cache while it's hashed, large
+#   enough for BLAKE3 to split it across threads
+CHUNK_SIZE = 1 << 20  # 1 MiB
+MMAP_THRESHOLD = 1 << 20  # 1 MiB
+# Reading this much costs about as much as reading a single block on a hard
+#   drive, and covers the whole of most small files
+HEAD_SIZE = 1 << 16  # 64 KiB
+# Beyond a few concurrent reads, the disk rather than the CPU is the limit;
+#   large files are also hashed with multiple threads by BLAKE3 itself
+HASH_WORKERS = min(8, os.cpu_count() or 1)
+PRINT_INTERVAL = 0.25
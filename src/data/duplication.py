@@ -16,36 +16,36 @@ class Duplication:
     Dataclass containing duplication entries
 
     Args:
-        size  (int)      : File size
-        md5   (str)      : MD5 hash
-        sha1  (str)      : SHA-1 hash
-        paths (list[str]): List of path strings with such data
+        size   (int)      : File size
+        blake3 (bytes)    : BLAKE3 digest
+        paths  (list[str]): List of path strings with such data
 
     Public Attributes:
-        size  (int)      : File size
-        md5   (str)      : MD5 hash
-        sha1  (str)      : SHA-1 hash
-        paths (list[str]): List of path strings with such data
+        size   (int)      : File size
+        blake3 (bytes)    : BLAKE3 digest
+        paths  (list[str]): List of path strings with such data
 
     Public Method:
         to_json_dict: Export duplication data to json-formatted dict
     """
 
+    __slots__ = ("size", "blake3", "paths")
+
     size: int
-    md5: str
-    sha1: str
+    blake3: bytes
     paths: list[str]
 
     def __lt__(self, other: Duplication) -> bool:
-        return (self.size, self.md5, self.sha1) < (other.size, other.md5, other.sha1)
+        return (self.size, self.blake3) < (other.size, other.blake3)
 
     def to_json_dict(self):
         return {
             "properties": {
                 "size": self.size,
                 "hashes": {
-                    "md5": self.md5,
-                    "sha1": self.sha1,
+                    # Digests are kept as raw bytes; they're only hex-encoded
+                    #   for output
+                    "blake3": self.blake3.hex(),
                 },
             },
             "paths": self.paths,
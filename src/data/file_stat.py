@@ -6,15 +6,21 @@ Public Classes:
 
 Public Types:
     DatabaseRow: A row of database data
-    IdStats    : Identifying stats of a file (size, MD5 hash, and SHA-1 hash)
+    IdStats    : Identifying stats of a file (size and BLAKE3 digest)
+    InodeStat  : Stats of a file on disk regardless of its path (device, inode,
+        size, and last modified timestamp)
+    HeadStat   : Stats telling apart files before hashing (size and BLAKE3
+        digest of the head)
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass
 
-DatabaseRow = tuple[str, str, str, str, str]
-IdStat = tuple[int, str, str]
+DatabaseRow = tuple[str, int, float, bytes, int, int, bytes, int]
+IdStat = tuple[int, bytes]
+InodeStat = tuple[int, int, int, float]
+HeadStat = tuple[int, bytes]
 
 
 @dataclass
@@ -23,52 +29,101 @@ class FileStat:
     Dataclass containing file statistics
 
     Args:
-        path  (str)  : Path of the file
-        size  (int)  : File size
-        mtime (float): Last modified timestamp
-        md5   (str)  : MD5 hash
-        sha1  (str)  : SHA-1 hash
+        path   (str)  : Path of the file
+        size   (int)  : File size
+        mtime  (float): Last modified timestamp
+        blake3 (bytes): BLAKE3 digest. Empty if the file was not hashed for
+            having a unique size and head
+        device (int)  : Device number of the filesystem. 0 if unknown
+        inode  (int)  : Inode number. 0 if unknown; e.g., for zip contents
+        head   (bytes): BLAKE3 digest of the first `HEAD_SIZE` bytes. Empty if
+            the head was not read for the file having a unique size
+        head_size (int): `HEAD_SIZE` when the head was read
 
     Public Attributes:
-        path  (str)  : Path of the file
-        size  (int)  : File size
-        mtime (float): Last modified timestamp
-        md5   (str)  : MD5 hash
-        sha1  (str)  : SHA-1 hash
+        path   (str)  : Path of the file
+        size   (int)  : File size
+        mtime  (float): Last modified timestamp
+        blake3 (bytes): BLAKE3 digest. Empty if the file was not hashed for
+            having a unique size and head
+        device (int)  : Device number of the filesystem. 0 if unknown
+        inode  (int)  : Inode number. 0 if unknown; e.g., for zip contents
+        head   (bytes): BLAKE3 digest of the first `HEAD_SIZE` bytes. Empty if
+            the head was not read for the file having a unique size
+        head_size (int): `HEAD_SIZE` when the head was read
 
     Public Methods:
         to_db_row:
-            Export to database row. Namely, a collection of strings
+            Export to database row
+        to_id_stat:
+            Export identifying information
+        to_inode_stat:
+            Export on-disk identifying information
         from_db_row (classmethod):
             Construct object from database row
     """
 
+    __slots__ = (
+        "path",
+        "size",
+        "mtime",
+        "blake3",
+        "device",
+        "inode",
+        "head",
+        "head_size",
+    )
+
     path: str
     size: int
     mtime: float
-    md5: str
-    sha1: str
+    blake3: bytes
+    device: int
+    inode: int
+    head: bytes
+    head_size: int
 
     def __lt__(self, other: FileStat) -> bool:
         return self.path < other.path
 
     def to_db_row(self) -> DatabaseRow:
         """
-        Export to database row. Namely, a collection of strings
+        Export to database row
 
         Returns:
             (DatabaseRow): A row of database data corresponding to this object
         """
-        return self.path, str(self.size), str(self.mtime), self.md5, self.sha1
+        return (
+            self.path,
+            self.size,
+            self.mtime,
+            self.blake3,
+            self.device,
+            self.inode,
+            self.head,
+            self.head_size,
+        )
 
     def to_id_stat(self) -> IdStat:
         """
         Export identifying information
 
         Returns:
-            (IdStat): Identifying information (size, MD5 hash, SHA-1 hash)
+            (IdStat): Identifying information (size, BLAKE3 digest)
+        """
+        return self.size, self.blake3
+
+    def to_inode_stat(self) -> InodeStat:
+        """
+        Export on-disk identifying information. A file that is renamed or
+            hard-linked keeps these. Inode numbers are only unique within a
+            filesystem, so the device is part of it
+
+        Returns:
+            (InodeStat):
+                On-disk identifying information (device, inode, size, mtime)
         """
-        return self.size, self.md5, self.sha1
+        return self.device, self.inode, self.size, self.mtime
 
     @classmethod
     def from_db_row(cls, db_row: DatabaseRow) -> FileStat:
@@ -81,5 +136,4 @@ class FileStat:
         Returns:
             (FileStat): Corresponding `FileStat` object
         """
-        path, size, mtime, md5, sha1 = db_row
-        return cls(path, int(size), float(mtime), md5, sha1)
+        return cls(*db_row)
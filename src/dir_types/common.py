@@ -4,31 +4,67 @@ Module: Common methods
 Public Functions:
     dir_get_stats:
         Get stats of a directory
+    count_sizes:
+        Count the sizes of all the files under this directory
+    read_heads:
+        Read the heads of all the files under this directory that share their
+        sizes with other files
+    read_head_factory:
+        A function that generates `read_head` method that catches corresponding
+        errors
+    count_heads:
+        Count the sizes and heads of all the files under this directory
     process_dir:
         Inspect all the files in this directory and get relevant properties
     process_file_factory:
     
+    skip_progress:
+        Count bytes as done without reading them
     hash:
-        Hash the file, currently via MD5 and SHA-1
+        Hash the file, currently via BLAKE3
 """
 
 from __future__ import annotations
 
-from hashlib import md5 as md5_factory, sha1 as sha1_factory
-from math import ceil
+import mmap
+import os
+from io import BufferedIOBase
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from threading import Lock, local
 from time import time
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterator, cast
 
+from blake3 import blake3 as blake3_factory
 from progbar import clear_print_clearable, shrink_str
 
 from .utils.error import NotAFileError
-from ..config import CHUNK_SIZE
-from ..data.file_stat import FileStat
+from ..config import (
+    CHUNK_SIZE,
+    HASH_WORKERS,
+    HEAD_SIZE,
+    MMAP_THRESHOLD,
+    PRINT_INTERVAL,
+)
+from ..data.file_stat import FileStat, HeadStat, InodeStat
 from ..utils.progress import ETA, Progress
 
 if TYPE_CHECKING:
     from .utils.type_ import UnionBasePath
 
+# Directories with no more bytes to read than this are processed in the calling
+#   thread, as handing tiny files to the pool costs more than it saves. Large
+#   files are always handed over, even if the directory has only a few
+_PARALLEL_THRESHOLD = 1 << 16  # 64 KiB
+
+_executor = ThreadPoolExecutor(max_workers=HASH_WORKERS)
+# Guards `Progress` and `ETA` updates from the worker threads
+_progress_lock = Lock()
+# Time of the last progress print, shared by all threads
+_last_print_time = 0.0
+# Per-thread read buffer, reused across files
+_thread_local = local()
+
 
 def dir_get_stats(self: UnionBasePath) -> None:
     """
@@ -37,17 +73,132 @@ def dir_get_stats(self: UnionBasePath) -> None:
      - Modified time: Not used, current time stored
      - Length       : Sum of length of all valid subfolders and number of files
     """
-    dir_size_total = sum(path.size for path in self.filtered_dirs)
-    file_size_total = sum(path.size for path in self.filtered_files)
-    self.size = dir_size_total + file_size_total
+    size = 0
+    length = len(self.filtered_files)
+    for dir_ in self.filtered_dirs:
+        size += dir_.size
+        length += dir_.length
+    for file in self.filtered_files:
+        size += file.size
+    self.size = size
     self.mtime = time()
-    dir_length_total = sum(path.length for path in self.filtered_dirs)
-    self.length = dir_length_total + len(self.filtered_files)
+    self.length = length
+
+
+def count_sizes(self: UnionBasePath, size_counts: Counter[int]) -> None:
+    """
+    Count the sizes of all the files under this directory
+
+    Args:
+        size_counts (Counter[int]): File size-number of files mapping
+    """
+    for file in self.filtered_files:
+        size_counts[file.size] += 1
+
+    for dir_ in self.filtered_dirs:
+        dir_.count_sizes(size_counts)
+
+
+def read_heads(
+    self: UnionBasePath,
+    existing_file_stats: dict[str, FileStat],
+    size_counts: Counter[int],
+) -> None:
+    """
+    Read the heads of all the files under this directory that share their
+        sizes with other files
+
+    Args:
+        existing_file_stats (dict[str, FileStat]):
+            Existing path string-file property mapping
+        size_counts (Counter[int]):
+            File size-number of files mapping of the whole tree
+    """
+    files = [file for file in self.filtered_files if size_counts[file.size] > 1]
+    parallel = sum(min(file.size, HEAD_SIZE) for file in files) > _PARALLEL_THRESHOLD
+    futures: list[Future[None]] = []
+
+    try:
+        for file in files:
+            if parallel:
+                futures.append(_executor.submit(file.read_head, existing_file_stats))
+            else:
+                file.read_head(existing_file_stats)
+
+        for dir_ in self.filtered_dirs:
+            dir_.read_heads(existing_file_stats, size_counts)
+
+        for future in futures:
+            future.result()
+
+    except BaseException:
+        for future in futures:
+            future.cancel()
+        wait(futures)
+        raise
+
+
+def read_head_factory(*errors: type[Exception]):
+    """
+    A function that generates `read_head` method that catches corresponding
+        errors
+    """
+
+    def read_head(self: UnionBasePath, existing_file_stats: dict[str, FileStat]):
+        """
+        Hash the first `HEAD_SIZE` bytes of this file and store the digest in
+            `self.head`. Most files of the same size already differ there, and
+            don't need to be hashed in full. The digest is left empty if the
+            file cannot be read
+
+        Args:
+            existing_file_stats (dict[str, FileStat]):
+                Existing path string-file property mapping
+        """
+        self_str = str(self)
+
+        existing_file_stat = existing_file_stats.get(self_str)
+        if (
+            existing_file_stat is not None
+            and existing_file_stat.mtime == self.mtime
+            and existing_file_stat.head
+            and existing_file_stat.head_size == HEAD_SIZE
+        ):
+            self.head = existing_file_stat.head
+            return
+
+        try:
+            with self.open("rb") as fp:
+                self.head = blake3_factory(fp.read(HEAD_SIZE)).digest()
+        except errors:
+            return
+
+        if _should_print(time()):
+            clear_print_clearable(shrink_str(self_str, prefix="[Head]"))
+
+    return read_head
+
+
+def count_heads(self: UnionBasePath, head_counts: Counter[HeadStat]) -> None:
+    """
+    Count the sizes and heads of all the files under this directory
+
+    Args:
+        head_counts (Counter[HeadStat]):
+            File size and head digest-number of files mapping
+    """
+    for file in self.filtered_files:
+        head_counts[file.size, file.head] += 1
+
+    for dir_ in self.filtered_dirs:
+        dir_.count_heads(head_counts)
 
 
 def process_dir(
     self: UnionBasePath,
     existing_file_stats: dict[str, FileStat],
+    inode_file_stats: dict[InodeStat, FileStat],
+    head_counts: Counter[HeadStat],
     total_progress: Progress,
     eta: ETA,
     new_file_stats: list[FileStat],
@@ -58,6 +209,10 @@ def process_dir(
     Args:
         existing_file_stats (dict[str, FileStat]):
             Existing path string-file property mapping
+        inode_file_stats (dict[InodeStat, FileStat]):
+            Existing on-disk stats-file property mapping
+        head_counts (Counter[HeadStat]):
+            File size and head digest-number of files mapping of the whole tree
         total_progress (Progress):
             Total progress data
         eta (ETA):
@@ -69,20 +224,58 @@ def process_dir(
         raise NotADirectoryError(f"Not a directory: {self}")
 
     dir_progress = Progress(len(self.filtered_files))
+    parallel = sum(file.size for file in self.filtered_files) > _PARALLEL_THRESHOLD
+    futures: list[Future[None]] = []
+
+    try:
+        for file in self.filtered_files:
+            dir_progress.current += 1
+            dir_progress_str = f"[{dir_progress.string}]"
+            if parallel:
+                futures.append(
+                    _executor.submit(
+                        file.process_file,
+                        existing_file_stats,
+                        inode_file_stats,
+                        head_counts,
+                        dir_progress_str,
+                        total_progress,
+                        eta,
+                        new_file_stats,
+                    )
+                )
+            else:
+                file.process_file(
+                    existing_file_stats,
+                    inode_file_stats,
+                    head_counts,
+                    dir_progress_str,
+                    total_progress,
+                    eta,
+                    new_file_stats,
+                )
 
-    for file in self.filtered_files:
-        dir_progress.current += 1
-        dir_progress_str = f"[{dir_progress.string}]"
-        file.process_file(
-            existing_file_stats,
-            dir_progress_str,
-            total_progress,
-            eta,
-            new_file_stats,
-        )
+        # Subdirectories are walked while the files above are being hashed
+        for dir_ in self.filtered_dirs:
+            dir_.process_dir(
+                existing_file_stats,
+                inode_file_stats,
+                head_counts,
+                total_progress,
+                eta,
+                new_file_stats,
+            )
 
-    for dir_ in self.filtered_dirs:
-        dir_.process_dir(existing_file_stats, total_progress, eta, new_file_stats)
+        # This directory is done only after all its files are; e.g., a zip file
+        #   must not be closed while its contents are still being read
+        for future in futures:
+            future.result()
+
+    except BaseException:
+        for future in futures:
+            future.cancel()
+        wait(futures)
+        raise
 
 
 def process_file_factory(*errors: type[Exception]):
@@ -94,17 +287,26 @@ def process_file_factory(*errors: type[Exception]):
     def process_file(
         self: UnionBasePath,
         existing_file_stats: dict[str, FileStat],
+        inode_file_stats: dict[InodeStat, FileStat],
+        head_counts: Counter[HeadStat],
         dir_progress_str: str,
         total_progress: Progress,
         eta: ETA,
         new_file_stats: list[FileStat],
     ) -> None:
         """
-        Inspect this file and get relevant properties
+        Inspect this file and get relevant properties. Files with a size and
+            head that no other file has cannot have duplicates, and are not
+            hashed
 
         Args:
             existing_file_stats (dict[str, FileStat]):
                 Existing path string-file property mapping
+            inode_file_stats (dict[InodeStat, FileStat]):
+                Existing on-disk stats-file property mapping
+            head_counts (Counter[HeadStat]):
+                File size and head digest-number of files mapping of the whole
+                tree
             dir_progress_str (str):
                 Directory progress data, formatted string
             total_progress (Progress):
@@ -119,85 +321,325 @@ def process_file_factory(*errors: type[Exception]):
         if not self.is_file():
             raise NotAFileError(f"Not a file: {self_str}")
 
-        if self_str in existing_file_stats:
-            existing_file_stat = existing_file_stats[self_str]
-
-            if existing_file_stat.mtime == self.mtime:
-                del existing_file_stats[self_str]
+        needs_hash = head_counts[self.size, self.head] > 1
+
+        existing_file_stat = existing_file_stats.get(self_str)
+        if existing_file_stat is not None and existing_file_stat.mtime == self.mtime:
+            # The file is unchanged; its record is either kept, or replaced by
+            #   a new one below
+            del existing_file_stats[self_str]
+
+            # A file recorded without a hash must be hashed once another file
+            #   of the same size and head shows up
+            if existing_file_stat.blake3 or not needs_hash:
+                _skip_file(self, self_str, dir_progress_str, total_progress, eta)
+                # Keep a head read in this run for later runs
+                if self.head and (
+                    self.head != existing_file_stat.head
+                    or existing_file_stat.head_size != HEAD_SIZE
+                ):
+                    new_file_stats.append(
+                        _new_file_stat(self, self_str, existing_file_stat.blake3)
+                    )
+                return
 
-                total_progress.current += self.size
-                eta.left -= self.size
+        if not needs_hash:
+            _skip_file(self, self_str, dir_progress_str, total_progress, eta)
+            new_file_stats.append(_new_file_stat(self, self_str, b""))
+            return
 
-                clear_print_clearable(
-                    shrink_str(
-                        str(self),
-                        prefix=f"{total_progress.percent} {eta.string} {dir_progress_str}",
-                    )
+        # A file that has been renamed or hard-linked since it was hashed keeps
+        #   its device, inode, size, and mtime. These can still collide, e.g.,
+        #   on filesystems with unstable inode numbers or coarse mtimes; the
+        #   head must match too
+        if self.inode:
+            inode_file_stat = inode_file_stats.get(
+                (self.device, self.inode, self.size, self.mtime)
+            )
+            if inode_file_stat is not None and inode_file_stat.head == self.head:
+                _skip_file(self, self_str, dir_progress_str, total_progress, eta)
+                new_file_stats.append(
+                    _new_file_stat(self, self_str, inode_file_stat.blake3)
                 )
-
                 return
 
+        # The head of a small file is the whole file
+        if self.head and self.size <= HEAD_SIZE:
+            _skip_file(self, self_str, dir_progress_str, total_progress, eta)
+            new_file_stats.append(_new_file_stat(self, self_str, self.head))
+            return
+
         try:
-            md5_str, sha1_str = self.hash(dir_progress_str, total_progress, eta)
+            blake3_digest = self.hash(self_str, dir_progress_str, total_progress, eta)
         except errors:
-            total_progress.current += self.size
-            eta.left -= self.size
+            skip_progress(self.size, total_progress, eta)
             return
 
-        new_file_stats.append(
-            FileStat(str(self), self.size, self.mtime, md5_str, sha1_str)
-        )
+        new_file_stats.append(_new_file_stat(self, self_str, blake3_digest))
 
     return process_file
 
 
+def _new_file_stat(self: UnionBasePath, self_str: str, blake3: bytes) -> FileStat:
+    """
+    Make the record of this file. Heads are only comparable if they are read
+        with the same `HEAD_SIZE`, so it's recorded along with the head
+
+    Args:
+        self_str (str)  : String representation of this path
+        blake3   (bytes): BLAKE3 digest, or empty if not hashed
+
+    Returns:
+        (FileStat): Record of this file
+    """
+    return FileStat(
+        self_str,
+        self.size,
+        self.mtime,
+        blake3,
+        self.device,
+        self.inode,
+        self.head,
+        HEAD_SIZE,
+    )
+
+
+def _skip_file(
+    self: UnionBasePath,
+    self_str: str,
+    dir_progress_str: str,
+    total_progress: Progress,
+    eta: ETA,
+) -> None:
+    """
+    Count the file as done without reading it
+
+    Args:
+        self_str         (str)     : String representation of this path
+        dir_progress_str (str)     : Directory progress data, formatted string
+        total_progress   (Progress): Total progress data
+        eta              (ETA)     : ETA data
+    """
+    skip_progress(self.size, total_progress, eta)
+
+    if _should_print(time()):
+        clear_print_clearable(
+            shrink_str(
+                self_str,
+                prefix=f"{total_progress.percent} {eta.string} {dir_progress_str}",
+            )
+        )
+
+
+def skip_progress(size: int, total_progress: Progress, eta: ETA) -> None:
+    """
+    Count bytes as done without reading them
+
+    Args:
+        size           (int)     : Number of bytes skipped
+        total_progress (Progress): Total progress data
+        eta            (ETA)     : ETA data
+    """
+    with _progress_lock:
+        total_progress.current += size
+        eta.left -= size
+
+
 def hash(
     self: UnionBasePath,
+    self_str: str,
     dir_progress_str: str,
     total_progress: Progress,
     eta: ETA,
-) -> tuple[str, str]:
+) -> bytes:
     """
-    Hash the file, currently via MD5 and SHA-1
+    Hash the file, currently via BLAKE3
 
     Args:
+        self_str         (str)     : String representation of this path
         dir_progress_str (str)     : Directory progress data, formatted string
         total_progress   (Progress): Total progress data
         eta              (ETA)     : ETA data
 
     Returns:
-        (str): MD5 hash hex
-        (str): SHA-1 hash hex
+        (bytes): BLAKE3 digest
     """
-    md5 = md5_factory()
-    sha1 = sha1_factory()
+    # BLAKE3 hashes with SIMD, and large chunks are also split across threads
+    blake3 = blake3_factory(max_threads=blake3_factory.AUTO)
 
-    num_chunks = ceil(self.size / CHUNK_SIZE)
-    chunk_progress = Progress(num_chunks)
+    # Only used for display; the file is read until EOF. Ceiling division is
+    #   done on integers to avoid float rounding on huge files
+    chunk_progress = Progress(-(-self.size // CHUNK_SIZE))
 
-    with self.open("rb") as fp:
-        for _ in range(num_chunks):
+    with _progress_lock:
+        eta.active += 1
+
+    try:
+        with self.open("rb") as fp:
             start = time()
+            # Bytes hashed since the shared progress was last updated
+            pending = 0
+
+            # Both regular and zip files are opened as buffered binary files,
+            #   though `zipfile.Path.open` is typed more loosely
+            for chunk in _iter_chunks(cast(BufferedIOBase, fp), self.size):
+                blake3.update(chunk)
+
+                pending += len(chunk)
+                chunk_progress.current += 1
+                now = time()
+
+                # The shared progress is contended by all the hashing threads;
+                #   only update it every so often
+                if now - start >= PRINT_INTERVAL:
+                    _add_progress(pending, now - start, total_progress, eta)
+                    start = now
+                    pending = 0
+
+                # Checked for every chunk, as most files are hashed well within
+                #   the interval
+                if _should_print(now):
+                    clear_print_clearable(
+                        shrink_str(
+                            self_str,
+                            prefix=(
+                                f"{total_progress.percent} {eta.string} "
+                                f"{dir_progress_str} [Chunk {chunk_progress.string}]"
+                            ),
+                        )
+                    )
 
-            chunk = fp.read(CHUNK_SIZE)
-            md5.update(chunk)
-            sha1.update(chunk)
-
-            chunk_size = len(chunk)
-            chunk_progress.current += 1
-            total_progress.current += chunk_size
-            eta.left -= chunk_size
-            eta.processed += chunk_size
-            eta.time_taken += time() - start
-
-            clear_print_clearable(
-                shrink_str(
-                    str(self),
-                    prefix=(
-                        f"{total_progress.percent} {eta.string} "
-                        f"{dir_progress_str} [Chunk {chunk_progress.string}]"
-                    ),
-                )
-            )
+            _add_progress(pending, time() - start, total_progress, eta)
+
+    finally:
+        with _progress_lock:
+            eta.active -= 1
+
+    return blake3.digest()
 
-    return md5.hexdigest(), sha1.hexdigest()
+
+def _add_progress(
+    size: int, time_taken: float, total_progress: Progress, eta: ETA
+) -> None:
+    """
+    Add newly hashed bytes to the shared progress
+
+    Args:
+        size           (int)     : Number of bytes hashed
+        time_taken     (float)   : Time taken to hash them
+        total_progress (Progress): Total progress data
+        eta            (ETA)     : ETA data
+    """
+    with _progress_lock:
+        total_progress.current += size
+        # Other files are being hashed at the same time; only count this file's
+        #   share of the elapsed time
+        eta.tick(size, time_taken / eta.active)
+
+
+def _should_print(now: float) -> bool:
+    """
+    Throttle progress prints to once every `PRINT_INTERVAL` seconds, as
+        terminal output is slow compared to skipping or hashing a small file
+
+    Args:
+        now (float): Current timestamp
+
+    Returns:
+        (bool): Whether progress should be printed now
+    """
+    global _last_print_time
+
+    # Racing threads may both print; that's harmless
+    if now - _last_print_time < PRINT_INTERVAL:
+        return False
+    _last_print_time = now
+    return True
+
+
+def _iter_chunks(fp: BufferedIOBase, size: int) -> Iterator[memoryview]:
+    """
+    Iterate through the file content in chunks of `CHUNK_SIZE`. Files no
+        smaller than `MMAP_THRESHOLD` are memory-mapped so that the chunks are
+        views into the page cache rather than freshly-read copies; others, and
+        files that cannot be mapped (e.g., zip file contents), are read into a
+        reused buffer. The kernel is told that the file is read sequentially, and
+        that its cached pages can be dropped afterwards, as each file is only
+        read once
+
+    Args:
+        fp   (io.BufferedIOBase): Opened file
+        size (int)              : File size
+
+    Yields:
+        (memoryview): File content chunk, only valid until the next one
+    """
+    try:
+        fileno = fp.fileno()
+    except OSError:
+        # No underlying file descriptor
+        fileno = None
+
+    if fileno is not None:
+        _fadvise(fileno, "POSIX_FADV_SEQUENTIAL")
+
+    try:
+        if fileno is not None and size >= MMAP_THRESHOLD:
+            try:
+                mapped = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                # The file cannot be mapped
+                pass
+            else:
+                with mapped, memoryview(mapped) as view:
+                    if hasattr(mmap, "MADV_SEQUENTIAL"):
+                        mapped.madvise(mmap.MADV_SEQUENTIAL)
+                    for start in range(0, len(view), CHUNK_SIZE):
+                        with view[start : start + CHUNK_SIZE] as chunk:
+                            yield chunk
+                return
+
+        # Read until EOF rather than a precomputed number of chunks, in case the
+        #   file has changed since its size was taken. The buffer is always a
+        #   full chunk, so that a file that has grown is not read in tiny pieces
+        with _get_buffer() as buffer:
+            while chunk_size := fp.readinto(buffer):
+                with buffer[:chunk_size] as chunk:
+                    yield chunk
+
+    finally:
+        if fileno is not None:
+            _fadvise(fileno, "POSIX_FADV_DONTNEED")
+
+
+def _get_buffer() -> memoryview:
+    """
+    Get this thread's read buffer, so that reading doesn't allocate a new
+        `bytes` object for every chunk
+
+    Returns:
+        (memoryview): View of the buffer, `CHUNK_SIZE` bytes long
+    """
+    try:
+        buffer: bytearray = _thread_local.buffer
+    except AttributeError:
+        buffer = _thread_local.buffer = bytearray(CHUNK_SIZE)
+    return memoryview(buffer)
+
+
+def _fadvise(fileno: int, advice_name: str) -> None:
+    """
+    Advise the kernel on the access pattern of the whole file, if the platform
+        supports it
+
+    Args:
+        fileno      (int): File descriptor
+        advice_name (str): Name of the `os.POSIX_FADV_*` constant
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        os.posix_fadvise(fileno, 0, 0, getattr(os, advice_name))
+    except OSError:
+        # Advice is only a hint; e.g., it's not supported on pipes
+        pass
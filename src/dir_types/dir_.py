@@ -8,12 +8,22 @@ Public Classes:
 from __future__ import annotations
 
 import os
+from operator import attrgetter
 from pathlib import Path, WindowsPath, PosixPath
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional, Union
 
 from progbar import clear_print_clearable, shrink_str
 
-from .common import dir_get_stats, hash, process_dir, process_file_factory
+from .common import (
+    count_heads,
+    count_sizes,
+    dir_get_stats,
+    hash,
+    process_dir,
+    process_file_factory,
+    read_head_factory,
+    read_heads,
+)
 from .utils.check_whitelist import check_dir, check_file
 from .utils.error import InvalidDirectoryType
 from .utils.map_ import DIRECTORY_EXT
@@ -27,7 +37,9 @@ class DirPath(Path):
     Regular path (Directory)
 
     Args:
-        path (pathlib.Path): Path of the file/directory
+        path (pathlib.Path | os.DirEntry):
+            Path of the file/directory. A directory entry from `os.scandir`
+            also provides cached type and stat information
 
     Public Attributes:
         path (pathlib.Path):
@@ -37,26 +49,73 @@ class DirPath(Path):
         mtime (float):
             Last modified time of the file. For directories, it's not used and
             defaulted to current time
+        device (int):
+            Device number of the filesystem of the file, folded into 64 bits,
+            or 0 if unknown. Not set for directories
+        inode (int):
+            Inode number of the file, folded into 64 bits, or 0 if unknown.
+            Not set for directories
+        head (bytes):
+            Digest of the first bytes of the file, or empty if not read. Not
+            set for directories
         length (int):
             Number of files under this directory, or 1 if the path is a file
 
     Public Methods:
+        count_sizes:
+            Count the sizes of all the files under this directory
+        read_heads:
+            Read the heads of all the files under this directory that share
+            their sizes with other files
+        read_head:
+            Read the head of this file
+        count_heads:
+            Count the sizes and heads of all the files under this directory
         process_dir:
             Inspect all the files in this directory and get relevant properties
         process_file:
             Inspect this file and get relevant properties
+        is_dir:
+            Whether the path is a directory, cached by `os.scandir` if possible
+        is_file:
+            Whether the path is a file, cached by `os.scandir` if possible
     """
 
-    def __new__(cls, path: Path) -> DirPath:
+    __slots__ = (
+        "_entry",
+        "filtered_dirs",
+        "filtered_files",
+        "size",
+        "mtime",
+        "device",
+        "inode",
+        "head",
+        "length",
+    )
+
+    _entry: Optional[os.DirEntry[str]]
+
+    def __new__(cls, path: Union[Path, os.DirEntry[str]]) -> DirPath:
         """
         Make special subclasses depending on OS
         """
         if cls is DirPath:
             cls = _WindowsDirPath if os.name == "nt" else _PosixDirPath
         self = super().__new__(cls, path)
+        self._entry = path if isinstance(path, os.DirEntry) else None
         self._dirpath_init()
         return self
 
+    def is_dir(self) -> bool:
+        if self._entry is None:
+            return super().is_dir()
+        return self._entry.is_dir()
+
+    def is_file(self) -> bool:
+        if self._entry is None:
+            return super().is_file()
+        return self._entry.is_file()
+
     def _dirpath_init(self) -> None:
         """
         Initialization
@@ -77,31 +136,43 @@ class DirPath(Path):
             return
 
         try:
-            for subpath in sorted(self.iterdir()):
-                if subpath.is_dir():
-                    if check_dir(subpath):
-                        self.filtered_dirs.append(self.__class__(subpath))
-                    continue
-
-                if (cls := DIRECTORY_EXT.get(subpath.suffix)) is not None:
-                    try:
-                        cls(subpath, test=True)
-                    except InvalidDirectoryType:
-                        # Treat file as regular file if cannot be read correctly
-                        pass
-                    else:
-                        if check_dir(subpath):
-                            self.filtered_dirs.append(cls(subpath))
+            with os.scandir(self) as entries:
+                # `os.scandir` gets the entry types along with the names, so
+                #   most checks below don't need extra `stat` calls. The order
+                #   doesn't matter, as the results are sorted after the walk
+                for entry in entries:
+                    if entry.is_dir():
+                        if check_dir(entry.name, entry.path):
+                            self.filtered_dirs.append(self.__class__(entry))
                         continue
 
-                if subpath.is_file():
-                    if check_file(subpath):
-                        self.filtered_files.append(self.__class__(subpath))
-                    continue
+                    suffix = os.path.splitext(entry.name)[1]
+                    if (cls := DIRECTORY_EXT.get(suffix)) is not None:
+                        subpath = Path(entry.path)
+                        try:
+                            # Opening the file once both checks and reads it
+                            if check_dir(entry.name, entry.path):
+                                self.filtered_dirs.append(cls(subpath))
+                            else:
+                                cls(subpath, test=True)
+                        except InvalidDirectoryType:
+                            # Treat file as regular file if cannot be read correctly
+                            pass
+                        else:
+                            continue
+
+                    if entry.is_file():
+                        if check_file(entry.name, entry.path):
+                            self.filtered_files.append(self.__class__(entry))
+                        continue
 
         except PermissionError:
             return
 
+        # Files written together tend to have nearby inodes and to be stored
+        #   near each other; hashing them in inode order cuts down on seeks
+        self.filtered_files.sort(key=attrgetter("inode"))
+
     def _get_stats(self) -> None:
         """
         Get file stats and store them in `self.size` and `self.mtime`
@@ -109,11 +180,24 @@ class DirPath(Path):
         if self.is_dir():
             dir_get_stats(self)
         elif self.is_file():
-            stats = self.stat()
+            stats = self.stat() if self._entry is None else self._entry.stat()
             self.size = stats.st_size
             self.mtime = stats.st_mtime
+            # `os.scandir` doesn't give device and inode numbers on Windows,
+            #   leaving 0
+            self.device = _to_int64(stats.st_dev)
+            self.inode = _to_int64(stats.st_ino)
+            self.head = b""
             self.length = 1
 
+    count_sizes = count_sizes
+
+    read_heads = read_heads
+
+    read_head = read_head_factory(PermissionError, FileNotFoundError)
+
+    count_heads = count_heads
+
     process_dir = process_dir
 
     process_file = process_file_factory(PermissionError, FileNotFoundError)
@@ -126,8 +210,30 @@ class _WindowsDirPath(DirPath, WindowsPath):
     Windows version of DirPath
     """
 
+    __slots__ = ()
+
 
 class _PosixDirPath(DirPath, PosixPath):
     """
     Posix version of DirPath
     """
+
+    __slots__ = ()
+
+
+def _to_int64(num: int) -> int:
+    """
+    Fold a non-negative number into the signed 64-bit range that sqlite can
+        store. Some filesystems (e.g., NFS, FUSE, and overlayfs) give device
+        and inode numbers of 2^63 or more, and ReFS gives 128-bit inode numbers.
+        Numbers larger than 64 bits may collide once folded; digests are only
+        reused if the file heads match as well
+
+    Args:
+        num (int): Number to fold
+
+    Returns:
+        (int): Folded number
+    """
+    num &= (1 << 64) - 1
+    return num - (1 << 64) if num >= 1 << 63 else num
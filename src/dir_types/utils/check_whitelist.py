@@ -8,39 +8,41 @@ Public Functions:
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
-
 from ...config import WHITELIST
 
-if TYPE_CHECKING:
-    from .type_ import UnionBasePath
-
 
-def check_dir(path: UnionBasePath) -> bool:
+def check_dir(name: str, path_str: str) -> bool:
     """
     Check if a directory is in the whitelist
 
     Args:
-        path (UnionPath): The path to be checked, assuming it's a directory
+        name     (str): Name of the path to be checked, assuming it's a directory
+        path_str (str): String of the path to be checked
 
     Returns:
         (bool): Whether the path should be included; i.e., not in the whitelist
     """
-    return path.name not in WHITELIST.dirnames and str(path) not in WHITELIST.dirpaths
+    return name not in WHITELIST.dirnames and path_str not in WHITELIST.dirpaths
 
 
-def check_file(path: UnionBasePath) -> bool:
+def check_file(name: str, path_str: str) -> bool:
     """
     Check if a file is in the whitelist
 
     Args:
-        path (UnionPath): The path to be checked, assuming it's a file
+        name     (str): Name of the path to be checked, assuming it's a file
+        path_str (str): String of the path to be checked
 
     Returns:
         (bool): Whether the path should be included; i.e., not in the whitelist
     """
     return (
-        path.name not in WHITELIST.filenames
-        and (subpath_str := str(path)) not in WHITELIST.filepaths
-        and not any(regex.fullmatch(subpath_str) for regex in WHITELIST.fileregexes)
+        name not in WHITELIST.filenames
+        and path_str not in WHITELIST.filepaths
+        and (
+            not WHITELIST.fileregexes
+            or not any(
+                regex.fullmatch(path_str) is not None for regex in WHITELIST.fileregexes
+            )
+        )
     )
@@ -9,17 +9,28 @@ Public Classes:
 from __future__ import annotations
 
 import zipfile
+from collections import Counter, defaultdict
 from datetime import datetime
 from pathlib import Path
-from posixpath import dirname
+from posixpath import basename, dirname, join
 from typing import Iterator, Optional
 
 from progbar import clear_print_clearable, shrink_str
 
-from .common import dir_get_stats, hash, process_dir, process_file_factory
+from .common import (
+    count_heads,
+    count_sizes,
+    dir_get_stats,
+    hash,
+    process_dir,
+    process_file_factory,
+    read_head_factory,
+    read_heads,
+    skip_progress,
+)
 from .utils.check_whitelist import check_dir, check_file
 from .utils.error import InvalidDirectoryType
-from ..data.file_stat import FileStat
+from ..data.file_stat import FileStat, HeadStat, InodeStat
 from ..utils.progress import ETA, Progress
 
 
@@ -39,12 +50,30 @@ class ZipPath(zipfile.Path):
         mtime (float):
             Last modified time of the file. For directories, it's not used and
             defaulted to current time
+        device (int):
+            Always 0 for files, as zip contents don't have inodes. Not set for
+            directories
+        inode (int):
+            Always 0 for files, as zip contents don't have inodes. Not set for
+            directories
+        head (bytes):
+            Digest of the first bytes of the file, or empty if not read. Not
+            set for directories
         length (int):
             Number of files under this directory, or 1 if the path is a file
         root (readonly zipfile.ZipFile | None):
             Actual zip file object
 
     Public Methods:
+        count_sizes:
+            Count the sizes of all the files under this directory
+        read_heads:
+            Read the heads of all the files under this directory that share
+            their sizes with other files
+        read_head:
+            Read the head of this file
+        count_heads:
+            Count the sizes and heads of all the files under this directory
         process_dir:
             Inspect all the files in this directory and get relevant properties
         process_file:
@@ -54,6 +83,8 @@ class ZipPath(zipfile.Path):
             function calls
     """
 
+    _str: str
+
     def __init__(self, parent: RootZipPath, at: str) -> None:
         self._parent = parent
         self.at = at
@@ -63,6 +94,15 @@ class ZipPath(zipfile.Path):
     def root(self) -> Optional[zipfile.ZipFile]:
         return self._parent.root_fp
 
+    def __str__(self) -> str:
+        # `zipfile.Path` joins the string anew on every call; cache it like
+        #   `pathlib` does
+        try:
+            return self._str
+        except AttributeError:
+            self._str = super().__str__()
+            return self._str
+
     def _zipfile_init(self) -> None:
         """
         Initialization
@@ -81,15 +121,27 @@ class ZipPath(zipfile.Path):
         """
         if not self.is_dir():
             return
+        if self.root is None:
+            raise ValueError("Can't iterdir a closed zip file")
 
-        for subpath in self.iterdir():
-            if subpath.is_dir():
-                if check_dir(subpath):
-                    self.filtered_dirs.append(subpath)
+        # Entries are checked by their names, and only the ones kept are made
+        #   into `ZipPath`s, which recursively read their own subpaths
+        root_str = self.root.filename
+        # Always set, as the zip file is opened from a path
+        if root_str is None:
+            raise ValueError("Can't iterdir a zip file without a path")
+        for at in self._parent.children.get(self.at.rstrip("/"), ()):
+            name = basename(at.rstrip("/"))
+            path_str = join(root_str, at)
+
+            # Directory names end with "/", as in `zipfile.Path.is_dir`
+            if at.endswith("/"):
+                if check_dir(name, path_str):
+                    self.filtered_dirs.append(self._next(at))
 
             else:
-                if check_file(subpath):
-                    self.filtered_files.append(subpath)
+                if check_file(name, path_str):
+                    self.filtered_files.append(self._next(at))
 
     def _get_stats(self) -> None:
         """
@@ -102,17 +154,22 @@ class ZipPath(zipfile.Path):
                 raise ValueError("Can't iterdir a closed zip file")
             info = self.root.getinfo(self.at)
             self.size = info.file_size
-            date_time = (
-                info.date_time[0],
-                month if (month := info.date_time[1]) else 1,
-                day if (day := info.date_time[2]) else 1,
-                info.date_time[3],
-                info.date_time[4],
-                info.date_time[5],
-            )
-            self.mtime = datetime(*date_time).timestamp()
+            self.mtime = _zip_info_mtime(info)
+            # Zip contents don't have their own inodes
+            self.device = 0
+            self.inode = 0
+            self.head = b""
             self.length = 1
 
+    count_sizes = count_sizes
+
+    read_heads = read_heads
+
+    # `RuntimeError` is raised when the file is encrypted
+    read_head = read_head_factory(PermissionError, RuntimeError)
+
+    count_heads = count_heads
+
     process_dir = process_dir
 
     # `RuntimeError` is raised when the file is encrypted
@@ -129,15 +186,12 @@ class ZipPath(zipfile.Path):
             raise ValueError("Can't listdir a file")
         if self.root is None:
             raise ValueError("Can't iterdir a closed zip file")
-        subs = filter(self._is_child_str, sorted(self.root.namelist()))
+        subs = self._parent.children.get(self.at.rstrip("/"), ())
         return map(self._next, subs)
 
     def _next(self, at: str) -> ZipPath:
         return ZipPath(self._parent, at)
 
-    def _is_child_str(self, path_str: str):
-        return dirname(path_str.rstrip("/")) == self.at.rstrip("/")
-
 
 class RootZipPath(ZipPath):
     """
@@ -153,6 +207,9 @@ class RootZipPath(ZipPath):
     Public Attributes:
         root_fp (zipfile.ZipFile | None):
             Actual zip file object
+        children (dict[str, list[str]]):
+            Directory-children mapping of all the paths in the zip file, while
+            it's open
         at (str):
             Relative path within the zip file; always "" (empty string)
         size (int):
@@ -164,6 +221,9 @@ class RootZipPath(ZipPath):
             Actual zip file object, points to `self.root_fp`
 
     Public Methods:
+        read_heads:
+            Read the heads of all the files under this directory that share
+            their sizes with other files; added step to open zip file
         process_dir:
             Inspect all the files in this directory and get relevant properties;
             added step to open zip file
@@ -172,20 +232,28 @@ class RootZipPath(ZipPath):
     def __init__(self, path: Path, test: bool = False) -> None:
         self._path = path
         self.root_fp: Optional[zipfile.ZipFile] = None
-        if test:
-            try:
-                with self:
-                    pass
-            except (zipfile.BadZipFile, NotImplementedError, FileNotFoundError) as err:
-                raise InvalidDirectoryType from err
-            return
-        self._parent = self
-        self.at = ""
-        with self:
+        self.children: dict[str, list[str]] = {}
+        try:
+            self.__enter__()
+        except (zipfile.BadZipFile, NotImplementedError, FileNotFoundError) as err:
+            raise InvalidDirectoryType from err
+        try:
+            if test:
+                return
+            self._parent = self
+            self.at = ""
             self._zipfile_init()
+        finally:
+            self.__exit__()
 
     def __enter__(self) -> RootZipPath:
         self.root_fp = self._make()
+        # Group the names by parent once, instead of scanning all the names
+        #   whenever a directory is listed
+        children: defaultdict[str, list[str]] = defaultdict(list)
+        for name in self.root_fp.namelist():
+            children[dirname(name.rstrip("/"))].append(name)
+        self.children = children
         return self
 
     def __exit__(self, *_) -> None:
@@ -193,10 +261,36 @@ class RootZipPath(ZipPath):
             return
         self.root_fp.close()
         self.root_fp = None
+        self.children = {}
+
+    def read_heads(
+        self,
+        existing_file_stats: dict[str, FileStat],
+        size_counts: Counter[int],
+    ) -> None:
+        """
+        Read the heads of all the files under this directory that share their
+            sizes with other files
+
+        Args:
+            existing_file_stats (dict[str, FileStat]):
+                Existing path string-file property mapping
+            size_counts (Counter[int]):
+                File size-number of files mapping of the whole tree
+        """
+        try:
+            with self:
+                super().read_heads(existing_file_stats, size_counts)
+        except FileNotFoundError:
+            # The file may have been deleted since then; its files are left
+            #   without heads
+            pass
 
     def process_dir(
         self,
         existing_file_stats: dict[str, FileStat],
+        inode_file_stats: dict[InodeStat, FileStat],
+        head_counts: Counter[HeadStat],
         total_progress: Progress,
         eta: ETA,
         new_file_stats: list[FileStat],
@@ -207,6 +301,11 @@ class RootZipPath(ZipPath):
         Args:
             existing_file_stats (dict[str, FileStat]):
                 Existing path string-file property mapping
+            inode_file_stats (dict[InodeStat, FileStat]):
+                Existing on-disk stats-file property mapping
+            head_counts (Counter[HeadStat]):
+                File size and head digest-number of files mapping of the whole
+                tree
             total_progress (Progress):
                 Total progress data
             eta (ETA):
@@ -215,17 +314,42 @@ class RootZipPath(ZipPath):
                 Properties of all files visitied
         """
         try:
-            with self:
-                super().process_dir(
-                    existing_file_stats, total_progress, eta, new_file_stats
-                )
+            self.__enter__()
         except FileNotFoundError:
-            # The file may have been deleted since then
-            total_progress.current += self.size
-            eta.left -= self.size
+            # The file may have been deleted since then. None of its contents
+            #   have been counted yet
+            skip_progress(self.size, total_progress, eta)
+            return
+
+        try:
+            super().process_dir(
+                existing_file_stats,
+                inode_file_stats,
+                head_counts,
+                total_progress,
+                eta,
+                new_file_stats,
+            )
+        finally:
+            self.__exit__()
 
     def _make(self) -> zipfile.ZipFile:
         """
         Open the zipfile
         """
         return zipfile.FastLookup.make(self._path)  # type: ignore
+
+
+def _zip_info_mtime(info: zipfile.ZipInfo) -> float:
+    """
+    Get the last modified timestamp of a zip file entry
+
+    Args:
+        info (zipfile.ZipInfo): Zip file entry info
+
+    Returns:
+        (float): Last modified timestamp
+    """
+    year, month, day, hour, minute, second = info.date_time
+    # Some zip files store 0 for an unknown month/day
+    return datetime(year, month or 1, day or 1, hour, minute, second).timestamp()
@@ -30,23 +30,41 @@ class Db:
         write: Write data to database file
     """
 
-    _TABLE_NAME = "files"
+    # Renamed whenever the stored data is no longer compatible, so that stale
+    #   databases are not misread
+    _TABLE_NAME = "files_blake3"
+    # Table of MD5 and SHA1 digests, which cannot be converted to BLAKE3
+    _LEGACY_TABLE_NAME = "files"
+    _LEGACY_COLUMNS = ("path", "size", "last_modified", "md5", "sha1")
     _CREATE_TABLE_CMD = f"""
     CREATE TABLE IF NOT EXISTS {_TABLE_NAME} (
         path TEXT PRIMARY KEY,
-        size TEXT NOT NULL,
-        last_modified TEXT NOT NULL,
-        md5 TEXT NOT NULL,
-        sha1 TEXT NOT NULL
+        size INTEGER NOT NULL,
+        last_modified REAL NOT NULL,
+        blake3 BLOB NOT NULL,
+        device INTEGER NOT NULL,
+        inode INTEGER NOT NULL,
+        head BLOB NOT NULL,
+        head_size INTEGER NOT NULL
     );
     """
+    _LEGACY_COLUMNS_CMD = f"""
+    SELECT name
+    FROM pragma_table_info('{_LEGACY_TABLE_NAME}');
+    """
+    _DROP_LEGACY_TABLE_CMD = f"""
+    DROP TABLE {_LEGACY_TABLE_NAME};
+    """
     _SELECT_ROWS_CMD = f"""
-    SELECT path, size, last_modified, md5, sha1
+    SELECT path, size, last_modified, blake3, device, inode, head, head_size
     FROM {_TABLE_NAME};
     """
+    # A file that is hashed anew replaces its old row, even if that row was not
+    #   removed; e.g., when the run was interrupted
     _INSERT_ROW_CMD = f"""
-    INSERT INTO {_TABLE_NAME} (path, size, last_modified, md5, sha1)
-    VALUES (?, ?, ?, ?, ?);
+    INSERT OR REPLACE INTO {_TABLE_NAME}
+        (path, size, last_modified, blake3, device, inode, head, head_size)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?);
     """
     _DELETE_ROW_CMD = f"""
     DELETE FROM {_TABLE_NAME}
@@ -104,6 +122,29 @@ class Db:
                     (file_stat.to_db_row() for file_stat in file_stats),
                 )
 
+            self._drop_legacy_table(con)
+
+    def _drop_legacy_table(self, con: sqlite3.Connection) -> None:
+        """
+        Drop the table of MD5 and SHA1 digests written by older versions. Its
+            files have been hashed anew into the new table by now, and it would
+            only take up space. A table of the same name but a different layout
+            is left alone, as it's not ours
+
+        Args:
+            con (sqlite3.Connection): DB connection
+        """
+        columns = tuple(row[0] for row in con.execute(Db._LEGACY_COLUMNS_CMD))
+        if columns != Db._LEGACY_COLUMNS:
+            return
+
+        clear_print(
+            f"Discarding table `{Db._LEGACY_TABLE_NAME}` of MD5 and SHA1 digests "
+            f"written by older versions from {self.path}..."
+        )
+        with con:
+            con.execute(Db._DROP_LEGACY_TABLE_CMD)
+
     @contextmanager
     def _open_db(self) -> Generator[sqlite3.Connection, None, None]:
         """
@@ -9,6 +9,7 @@ Public Functions:
 """
 
 from json import dump as json_dump
+from operator import attrgetter
 from pathlib import Path
 
 from progbar import clear_print
@@ -69,7 +70,7 @@ def split_duplication_data(
         (list[Duplication]): Large duplication lists
         (list[Duplication]): Small duplication lists
     """
-    duplication_iter = iter(sorted(duplications))
+    duplication_iter = iter(sorted(duplications, key=attrgetter("size", "blake3")))
 
     large_duplications: list[Duplication] = []
     small_duplications: list[Duplication] = []
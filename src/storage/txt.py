@@ -8,7 +8,7 @@ Public Classes:
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Iterator
+from typing import Iterable
 
 from progbar import clear_print
 
@@ -30,12 +30,12 @@ class Txt:
     def __init__(self, path: Path) -> None:
         self.path = path
 
-    def write(self, data: Iterator[str]) -> None:
+    def write(self, data: Iterable[str]) -> None:
         """
         Write new file data to text file
 
         Args:
-            data (Iterator[str]): List of new file pathss
+            data (Iterable[str]): List of new file pathss
         """
         clear_print(f"Writing new file paths to {self.path}")
 
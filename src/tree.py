@@ -6,14 +6,15 @@ Public Functions:
     walk_tree: Get duplication data
 """
 
-from collections import defaultdict
+from collections import Counter, defaultdict
+from operator import attrgetter
 from pathlib import Path
 from traceback import print_exc
 
 from progbar import clear_print
 
 from .data.duplication import Duplication
-from .data.file_stat import FileStat, IdStat
+from .data.file_stat import FileStat, HeadStat, IdStat
 from .dir_types.dir_ import DirPath
 from .utils.byte import byte_shorten
 from .utils.progress import ETA, Progress
@@ -37,7 +38,7 @@ def make_tree(base_path: Path) -> DirPath:
 
 def walk_tree(
     root_dir: DirPath, existing_file_stats: dict[str, FileStat]
-) -> tuple[list[Duplication], list[FileStat], list[str]]:
+) -> tuple[list[Duplication], list[FileStat], list[str], list[str]]:
     """
     Get duplication data
 
@@ -49,17 +50,40 @@ def walk_tree(
 
     Returns:
         (list[Duplication]): All duplications
-        (list[FileStat])   : All file properties
+        (list[FileStat])   : File properties to be written to the database
         (list[str])        : Records to be removed from the database
+        (list[str])        : Paths of new or modified files
     """
     clear_print("Getting all file data...")
     total_progress = Progress(root_dir.size)
     eta = ETA(root_dir.size)
     leftover_file_stats = existing_file_stats.copy()
+    # Files that have moved can be found by their inodes instead of their paths
+    inode_file_stats = {
+        file_stat.to_inode_stat(): file_stat
+        for file_stat in existing_file_stats.values()
+        if file_stat.inode and file_stat.blake3
+    }
     new_file_stats: list[FileStat] = []
 
     try:
-        root_dir.process_dir(leftover_file_stats, total_progress, eta, new_file_stats)
+        # Files can only be duplicates of files of the same size, and of the
+        #   same head
+        size_counts: Counter[int] = Counter()
+        root_dir.count_sizes(size_counts)
+        clear_print("Reading file heads...")
+        root_dir.read_heads(existing_file_stats, size_counts)
+        head_counts: Counter[HeadStat] = Counter()
+        root_dir.count_heads(head_counts)
+
+        root_dir.process_dir(
+            leftover_file_stats,
+            inode_file_stats,
+            head_counts,
+            total_progress,
+            eta,
+            new_file_stats,
+        )
     except KeyboardInterrupt:
         clear_print("KeyboardInterrupt detected; stopping...")
         # Don't remove anything from the database if the procedure is interrupted
@@ -70,29 +94,47 @@ def walk_tree(
         print()
         leftover_file_stats = {}
 
-    new_file_stats.sort()
-    clear_print(
-        f"Found {root_dir.length} files, of which {len(new_file_stats)} are new"
-    )
+    # Sorting by key compares the path strings directly, rather than calling
+    #   the Python-level `FileStat.__lt__` for every comparison
+    new_file_stats.sort(key=attrgetter("path"))
+    # Unchanged files may also be recorded again; e.g., when they are hashed
+    #   for another file of the same size and head showing up
+    new_path_strs = [
+        file_stat.path
+        for file_stat in new_file_stats
+        if (existing_file_stat := existing_file_stats.get(file_stat.path)) is None
+        or existing_file_stat.mtime != file_stat.mtime
+    ]
+    clear_print(f"Found {root_dir.length} files, of which {len(new_path_strs)} are new")
 
     clear_print("Finding duplicates...")
+    # Records written in this run replace the existing ones of the same paths
+    file_stats = {
+        path_str: file_stat
+        for path_str, file_stat in existing_file_stats.items()
+        if path_str not in leftover_file_stats
+    }
+    file_stats.update((file_stat.path, file_stat) for file_stat in new_file_stats)
     potential_duplications: defaultdict[IdStat, list[str]] = defaultdict(list)
 
-    for path_str, file_stat in existing_file_stats.items():
-        if path_str in leftover_file_stats:
+    for path_str, file_stat in file_stats.items():
+        # Files that are not hashed have no duplicates
+        if not file_stat.blake3:
             continue
         potential_duplications[file_stat.to_id_stat()].append(path_str)
 
-    for file_stat in new_file_stats:
-        potential_duplications[file_stat.to_id_stat()].append(file_stat.path)
-
     duplications: list[Duplication] = []
 
     for id_stat, file_path_strs in potential_duplications.items():
         if len(file_path_strs) > 1:
             duplications.append(Duplication(*id_stat, file_path_strs))
 
-    duplications.sort()
+    duplications.sort(key=attrgetter("size", "blake3"))
 
     clear_print(f"Found {len(duplications)} groups of duplicates")
-    return duplications, new_file_stats, sorted(leftover_file_stats)
+    return (
+        duplications,
+        new_file_stats,
+        sorted(leftover_file_stats),
+        new_path_strs,
+    )
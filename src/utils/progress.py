@@ -50,22 +50,40 @@ class ETA:
         left       (int)  : Number of elements left
         processed  (int)  : ID of current element
         time_taken (float): Time taken for all processed elements
+        active     (int)  : Number of elements being processed concurrently
 
     Public Attributes:
         left       (int)         : Number of elements left
         processed  (int)         : ID of current element
         time_taken (float)       : Time taken for all processed elements
+        active     (int)         : Number of elements being processed concurrently
         string     (readonly str): String representation of ETA
+
+    Public Methods:
+        tick: Record newly processed elements
     """
 
     left: int
     processed: int = 0
     time_taken: float = 0.0
+    active: int = 0
 
     @property
     def string(self) -> str:
         return _time_remaining(self.left, self.processed, self.time_taken)
 
+    def tick(self, count: int, time_taken: float) -> None:
+        """
+        Record newly processed elements
+
+        Args:
+            count      (int)  : Number of elements processed
+            time_taken (float): Time taken for these elements
+        """
+        self.left -= count
+        self.processed += count
+        self.time_taken += time_taken
+
 
 @dataclass
 class TotalTime:
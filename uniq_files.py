@@ -15,7 +15,9 @@ def main():
     # Get total size estimate, and make tree
     root_dir = make_tree(args.dir_path)
     # Walk through all files
-    duplications, new_file_stats, removed_path_strs = walk_tree(root_dir, db_data)
+    duplications, new_file_stats, removed_path_strs, new_path_strs = walk_tree(
+        root_dir, db_data
+    )
     # Write duplication data
     if args.small_json is None:
         args.dup_json.write(duplications, "duplications")
@@ -29,7 +31,7 @@ def main():
     args.db.write(new_file_stats, removed_path_strs)
     # Write new file paths
     if args.new_txt is not None:
-        args.new_txt.write((file_stat.path for file_stat in new_file_stats))
+        args.new_txt.write(new_path_strs)
     # Total time used
     print(f"Time taken: {total_time.string}")
 